@@ -18,16 +18,20 @@ Performance:
 
 import os
 import sys
+import gzip
 import json
 import hashlib
+import mmap
 import time
 import logging
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from pathlib import Path
 from watchdog.observers import Observer
 from watchdog.events import FileSystemEventHandler
-from concurrent.futures import ThreadPoolExecutor, as_completed
-from threading import Lock
+from concurrent.futures import ThreadPoolExecutor, wait
+from threading import Event, Lock, Thread
 
 # Configure logging
 logging.basicConfig(
@@ -37,11 +41,34 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# MIME types for the supported CV extensions (lowercase suffix -> type)
+MIME_TYPES = {
+    '.pdf': 'application/pdf',
+    '.docx': 'application/vnd.openxmlformats-officedocument.wordprocessingml.document',
+    '.doc': 'application/msword',
+    '.txt': 'text/plain',
+    '.md': 'text/markdown',
+}
+
 
 class TanovaCVHandler(FileSystemEventHandler):
     """Watches folder for CV files and syncs them to Tanova."""
 
     SUPPORTED_EXTENSIONS = ('.pdf', '.docx', '.doc', '.txt', '.md')
+    _EXT_SET = frozenset(SUPPORTED_EXTENSIONS)
+
+    # Checksums per request to the batch duplicate-check endpoint
+    DUPLICATE_BATCH_SIZE = 500
+
+    # Seconds a file must go without new events before it is synced
+    DEBOUNCE_SECONDS = 1.0
+
+    # Files submitted to the worker pool per wait() round during initial sync
+    UPLOAD_CHUNK_SIZE = 50
+
+    # Files larger than this are hashed through mmap (below it, the mmap
+    # setup costs more than the chunked read it replaces)
+    MMAP_THRESHOLD = 64 * 1024
 
     def __init__(self, config):
         self.folder_path = config['folder_path']
@@ -53,91 +80,341 @@ class TanovaCVHandler(FileSystemEventHandler):
 
         # Persistent HTTP session for connection pooling
         self.session = requests.Session()  # NEW: Reuse connections
-        self.session.headers.update({'X-Tanova-API-Key': self.api_key})
+        self.session.headers.update({
+            'X-Tanova-API-Key': self.api_key,
+            'Connection': 'keep-alive',
+        })
+
+        # NEW: Size the connection pool for the worker count. The default
+        # adapter keeps only 10 connections, so bursts of interleaved
+        # duplicate-checks and uploads evict warm connections and pay a
+        # fresh TLS handshake. pool_block makes workers wait for a pooled
+        # connection instead of opening throwaway extras.
+        # Retries live here too: urllib3 re-sends on connection failures
+        # and 5xx responses with exponential backoff, without re-hashing
+        # the file or re-running the duplicate check like the old
+        # recursive sync_file retry did.
+        retry = Retry(
+            total=self.retry_count,
+            backoff_factor=self.retry_delay,
+            status_forcelist=(500, 502, 503, 504),
+            allowed_methods=frozenset(['POST']),
+            respect_retry_after_header=True,
+        )
+        adapter = HTTPAdapter(
+            pool_connections=self.max_workers,
+            pool_maxsize=self.max_workers * 2,
+            pool_block=True,
+            max_retries=retry,
+        )
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
 
         # Thread-safe sync tracking
         self.synced_files = self._load_sync_history()
         self.checksum_cache = {}  # NEW: Cache checksums to avoid recalculation
         self.history_lock = Lock()  # NEW: Thread-safe history updates
-        self.unsaved_count = 0  # NEW: Track unsaved changes
+        self.pending_checksums = []  # NEW: Checksums waiting to be appended to the log
+
+        # NEW: One long-lived worker pool shared by the initial sync and
+        # watchdog events, instead of spinning a pool up per batch
+        self.executor = ThreadPoolExecutor(max_workers=self.max_workers)
+
+        # NEW: Debounce queue for watchdog events. Editors save with
+        # write-then-rename and the OS emits several create/modify events
+        # per file, so handlers only record the path here and a background
+        # thread syncs it once it has been quiet for DEBOUNCE_SECONDS.
+        self.pending_events = {}
+        self.pending_events_lock = Lock()
+
+        # NEW: On Linux, inotify delivers IN_CLOSE_WRITE (watchdog's
+        # on_closed) once the writer closes the file, so files can be
+        # synced immediately instead of waiting out the debounce window
+        self._use_close_write = sys.platform.startswith('linux')
+        self._stop_event = Event()
+        self._debounce_thread = Thread(target=self._drain_pending_events, daemon=True)
+        self._debounce_thread.start()
 
         logger.info(f'✓ Loaded {len(self.synced_files)} previously synced files from history')
 
+    HISTORY_LOG = Path.home() / '.tanova' / 'sync_history.bin'
+
+    # Bytes per history record (raw SHA-256 digest)
+    HISTORY_RECORD_SIZE = 32
+
     def _load_sync_history(self):
-        """Load previously synced file checksums from local cache."""
-        cache_file = Path.home() / '.tanova' / 'sync_history.json'
-        if cache_file.exists():
+        """
+        Load previously synced file checksums from the local append-only log.
+
+        NEW: The log stores raw 32-byte digests back to back instead of
+        hex lines - half the bytes on disk, and loading is one read() plus
+        a slicing comprehension rather than parsing 10k+ strings. A
+        partial record at the tail (crash mid-append) is ignored. Migrates
+        the legacy hex-line log and sync_history.json on first run.
+        """
+        synced = set()
+
+        if self.HISTORY_LOG.exists():
             try:
-                with open(cache_file, 'r') as f:
-                    return set(json.load(f))
+                with open(self.HISTORY_LOG, 'rb') as f:
+                    data = f.read()
             except Exception as e:
                 logger.warning(f'Could not load sync history: {e}')
-        return set()
+                return synced
+            leftover = len(data) % self.HISTORY_RECORD_SIZE
+            usable = len(data) - leftover
+            synced = {
+                data[i:i + self.HISTORY_RECORD_SIZE].hex()
+                for i in range(0, usable, self.HISTORY_RECORD_SIZE)
+            }
+            if leftover:
+                # A torn tail would misalign every record appended after
+                # it, so realign the log now by rewriting it. If the
+                # rewrite fails (e.g. the disk that tore the append is
+                # full), carry on with the in-memory set.
+                try:
+                    self._rewrite_history(synced)
+                except Exception as e:
+                    logger.warning(f'Could not realign sync history: {e}')
+            else:
+                self._compact_history(synced)
+            return synced
+
+        # Migrate history from versions that used hex lines or JSON
+        for legacy_file, loader in (
+            (self.HISTORY_LOG.with_suffix('.log'), self._read_legacy_log),
+            (self.HISTORY_LOG.with_suffix('.json'), self._read_legacy_json),
+        ):
+            if legacy_file.exists():
+                try:
+                    synced = loader(legacy_file)
+                    self._rewrite_history(synced)
+                    legacy_file.unlink()
+                    logger.info(f'✓ Migrated legacy sync history ({len(synced)} entries)')
+                except Exception as e:
+                    logger.warning(f'Could not migrate legacy sync history: {e}')
+                break
 
-    def _save_sync_history(self, force=False):
+        return synced
+
+    @staticmethod
+    def _read_legacy_log(path):
+        """Read the old hex-line history log."""
+        with open(path, 'r') as f:
+            return {line.strip() for line in f if line.strip()}
+
+    @staticmethod
+    def _read_legacy_json(path):
+        """Read the original sync_history.json."""
+        with open(path, 'r') as f:
+            return set(json.load(f))
+
+    def _rewrite_history(self, synced):
         """
-        Save synced file checksums to local cache.
+        Rewrite the history log from scratch as packed raw digests.
 
-        Args:
-            force: Save immediately (ignore batch threshold)
+        NEW: Writes to a sibling temp file and renames it into place with
+        os.replace, so a crash mid-rewrite leaves the old log intact
+        instead of a truncated one.
         """
-        # NEW: Batch saves to reduce I/O (save every 10 files, not after each one)
-        if not force and self.unsaved_count < 10:
-            return
+        self.HISTORY_LOG.parent.mkdir(exist_ok=True)
+        tmp_file = self.HISTORY_LOG.with_suffix('.bin.tmp')
+        with open(tmp_file, 'wb') as f:
+            f.write(b''.join(bytes.fromhex(c) for c in synced))
+        os.replace(tmp_file, self.HISTORY_LOG)
 
-        cache_file = Path.home() / '.tanova' / 'sync_history.json'
-        cache_file.parent.mkdir(exist_ok=True)
+    def _compact_history(self, synced):
+        """
+        Compact the history log if duplicate records have bloated it.
+
+        Re-synced files append their checksum again, so after long uptimes
+        the log can grow past the unique entry count. Rewrite it once at
+        startup when it exceeds twice the size of the deduplicated set.
+        """
+        try:
+            if self.HISTORY_LOG.stat().st_size > 2 * len(synced) * self.HISTORY_RECORD_SIZE:
+                self._rewrite_history(synced)
+                logger.info(f'✓ Compacted sync history log ({len(synced)} entries)')
+        except Exception as e:
+            logger.warning(f'Could not compact sync history: {e}')
+
+    def _append_checksums(self, new_list):
+        """Append newly-synced checksums to the history log (caller holds lock)."""
+        self.HISTORY_LOG.parent.mkdir(exist_ok=True)
+        try:
+            with open(self.HISTORY_LOG, 'ab') as f:
+                f.write(b''.join(bytes.fromhex(c) for c in new_list))
+                f.flush()
+        except Exception as e:
+            logger.warning(f'Could not save sync history: {e}')
+
+    def _save_sync_history(self, force=False):
+        """
+        Flush pending checksums to the history log.
 
+        Args:
+            force: Flush immediately (ignore batch threshold)
+        """
+        # NEW: Batch appends to reduce I/O (flush every 10 files, not after each one)
         with self.history_lock:
-            try:
-                with open(cache_file, 'w') as f:
-                    json.dump(list(self.synced_files), f)
-                self.unsaved_count = 0
-            except Exception as e:
-                logger.warning(f'Could not save sync history: {e}')
+            if not self.pending_checksums:
+                return
+            if not force and len(self.pending_checksums) < 10:
+                return
+            self._append_checksums(self.pending_checksums)
+            self.pending_checksums = []
 
     def on_created(self, event):
         """Handle file creation events."""
         if not event.is_directory and self._is_cv_file(event.src_path):
             logger.info(f'📁 Detected new file: {Path(event.src_path).name}')
-            time.sleep(1)  # Ensure file is fully written
-            self.sync_file(event.src_path)
+            # Debounce even where IN_CLOSE_WRITE is available: a file
+            # moved in from outside the watched tree surfaces as a bare
+            # created event with no close or moved event to follow, so
+            # the debounce is the backstop that still syncs it. Writes
+            # in progress get short-circuited by on_closed instead.
+            self._schedule_sync(event.src_path)
 
     def on_modified(self, event):
         """Handle file modification events."""
         if not event.is_directory and self._is_cv_file(event.src_path):
             logger.info(f'📝 Detected modified file: {Path(event.src_path).name}')
-            time.sleep(1)
-            self.sync_file(event.src_path)
+            self._schedule_sync(event.src_path)
+
+    def on_closed(self, event):
+        """
+        Handle close-after-write events (Linux inotify only).
+
+        NEW: IN_CLOSE_WRITE fires after the writing process closes its
+        file descriptor, so the file is guaranteed complete - cancel the
+        pending debounce entry and sync it right away, with no debounce
+        delay and no partial-write race.
+        """
+        if not event.is_directory and self._is_cv_file(event.src_path):
+            logger.info(f'📁 File ready: {Path(event.src_path).name}')
+            with self.pending_events_lock:
+                self.pending_events.pop(event.src_path, None)
+            self.executor.submit(self.sync_file, event.src_path)
+
+    def on_moved(self, event):
+        """Handle files moved or renamed into the watched folder."""
+        dest_path = getattr(event, 'dest_path', None)
+        if not event.is_directory and dest_path and self._is_cv_file(dest_path):
+            logger.info(f'📁 Detected moved file: {Path(dest_path).name}')
+            if self._use_close_write:
+                # A completed move (IN_MOVED_TO) never gets a close event,
+                # but the file is already whole - sync immediately
+                self.executor.submit(self.sync_file, dest_path)
+            else:
+                self._schedule_sync(dest_path)
+
+    def _schedule_sync(self, file_path):
+        """Record a file event; the debounce thread syncs it once it settles."""
+        with self.pending_events_lock:
+            self.pending_events[file_path] = time.monotonic()
+
+    def _drain_pending_events(self):
+        """Background loop that submits files whose events have settled."""
+        while not self._stop_event.wait(0.25):
+            now = time.monotonic()
+            with self.pending_events_lock:
+                ready = [
+                    path for path, last_seen in self.pending_events.items()
+                    if now - last_seen >= self.DEBOUNCE_SECONDS
+                ]
+                for path in ready:
+                    del self.pending_events[path]
+            for path in ready:
+                self.executor.submit(self.sync_file, path)
+
+    def stop(self):
+        """Stop the debounce thread and worker pool, flushing history."""
+        self._stop_event.set()
+        # Join before shutting the executor down: a drain iteration that
+        # already collected paths would otherwise submit to a dead pool.
+        # The thread wakes from its 250 ms poll, so this is near-instant.
+        self._debounce_thread.join()
+        self.executor.shutdown(wait=True)
+        self._save_sync_history(force=True)
 
     def _is_cv_file(self, file_path):
         """Check if file is a supported CV file type."""
-        return file_path.lower().endswith(self.SUPPORTED_EXTENSIONS)
+        # NEW: Lowercase only the suffix and test a frozenset - no
+        # lowercase copy of the whole path and no tuple scan, which adds
+        # up on the watchdog hot loop where modify events fire per write
+        return os.path.splitext(file_path)[1].lower() in self._EXT_SET
+
+    # Extended attributes used as a persistent checksum cache on the source files
+    XATTR_KEY = 'user.tanova.key'
+    XATTR_SHA256 = 'user.tanova.sha256'
 
-    def calculate_checksum(self, file_path):
+    def calculate_checksum(self, file_path, st=None):
         """
         Calculate SHA-256 checksum of file with caching.
 
         NEW: Caches checksums based on file modification time to avoid
-        recalculating for unchanged files.
+        recalculating for unchanged files. The checksum is also stored as
+        an extended attribute on the file itself (keyed on mtime+size), so
+        the cache survives service restarts without re-reading every file.
+        Filesystems without xattr support fall back to hashing.
+
+        Args:
+            st: os.stat_result for the file if the caller already has one
+                (e.g. from the scandir scan), saving a stat syscall
         """
         try:
-            # Check cache first
-            mtime = os.path.getmtime(file_path)
+            # Check in-memory cache first
+            if st is None:
+                st = os.stat(file_path)
+            mtime = st.st_mtime
             if file_path in self.checksum_cache:
                 cached_mtime, cached_checksum = self.checksum_cache[file_path]
                 if cached_mtime == mtime:
                     return cached_checksum
 
+            # Check persistent xattr cache (Linux; no-op elsewhere)
+            xattr_key = f'{st.st_mtime_ns}:{st.st_size}'
+            if hasattr(os, 'getxattr'):
+                try:
+                    if os.getxattr(file_path, self.XATTR_KEY).decode() == xattr_key:
+                        checksum = os.getxattr(file_path, self.XATTR_SHA256).decode()
+                        self.checksum_cache[file_path] = (mtime, checksum)
+                        return checksum
+                except OSError:
+                    pass  # Attribute missing or filesystem rejects xattrs
+
             # Calculate checksum
-            sha256 = hashlib.sha256()
+            # NEW: files over MMAP_THRESHOLD are mmap'd and hashed in one
+            # update straight off the page cache - no per-chunk bytes
+            # allocations (a 10 MB CV otherwise churns ~1250 of them).
+            # Smaller files go through hashlib.file_digest (Python 3.11+),
+            # whose C read/update loop releases the GIL so worker threads
+            # hash in parallel; older interpreters keep the chunked loop.
             with open(file_path, 'rb') as f:
-                for chunk in iter(lambda: f.read(8192), b''):
-                    sha256.update(chunk)
-
-            checksum = sha256.hexdigest()
-
-            # Update cache
+                checksum = None
+                if st.st_size > self.MMAP_THRESHOLD:
+                    try:
+                        with mmap.mmap(f.fileno(), st.st_size, access=mmap.ACCESS_READ) as mm:
+                            checksum = hashlib.sha256(mm).hexdigest()
+                    except (OSError, ValueError):
+                        f.seek(0)  # mmap unsupported here; hash the stream
+                if checksum is None:
+                    if hasattr(hashlib, 'file_digest'):
+                        checksum = hashlib.file_digest(f, 'sha256').hexdigest()
+                    else:
+                        sha256 = hashlib.sha256()
+                        for chunk in iter(lambda: f.read(8192), b''):
+                            sha256.update(chunk)
+                        checksum = sha256.hexdigest()
+
+            # Update caches (digest written before the key, so a crash in
+            # between never leaves a valid key pointing at a stale digest)
+            if hasattr(os, 'setxattr'):
+                try:
+                    os.setxattr(file_path, self.XATTR_SHA256, checksum.encode())
+                    os.setxattr(file_path, self.XATTR_KEY, xattr_key.encode())
+                except OSError:
+                    pass  # Read-only file or filesystem rejects xattrs
             self.checksum_cache[file_path] = (mtime, checksum)
 
             return checksum
@@ -167,65 +444,73 @@ class TanovaCVHandler(FileSystemEventHandler):
 
         return metadata
 
-    def sync_file(self, file_path, retry_attempt=0):
-        """Sync a single file to Tanova."""
+    def sync_file(self, file_path, checksum=None, server_checked=False):
+        """
+        Sync a single file to Tanova.
+
+        Retries (network failures, 5xx) are handled by the urllib3 Retry
+        policy on the session adapter, so a failed attempt is re-sent from
+        the connection pool without re-hashing or re-checking duplicates.
+
+        Args:
+            checksum: SHA-256 hex digest if the caller already computed it
+                (the initial-sync pre-filter does), skipping a recalculation
+            server_checked: the batch duplicate check already confirmed the
+                server does not have this checksum, so skip the per-file check
+        """
         logger.info(f'🔄 Starting sync: {Path(file_path).name}')
         try:
-            # Calculate checksum
-            checksum = self.calculate_checksum(file_path)
+            # Calculate checksum (unless the pre-filter already did)
+            if checksum is None:
+                checksum = self.calculate_checksum(file_path)
             if not checksum:
                 return False
 
-            # Skip if already synced locally (thread-safe check)
-            with self.history_lock:
-                if checksum in self.synced_files:
-                    logger.info(f'⏭️  Skipped (already synced): {Path(file_path).name}')
-                    return True
+            # Skip if already synced locally. The membership test runs
+            # without history_lock: CPython set reads are atomic under the
+            # GIL, checksums only ever get added (never removed), and a
+            # miss is caught again by the server-side duplicate check - so
+            # workers don't serialize through the mutex on the fast path.
+            # Mutations of synced_files still take the lock.
+            if checksum in self.synced_files:
+                logger.info(f'⏭️  Skipped (already synced): {Path(file_path).name}')
+                return True
 
             # NEW: Check if duplicate exists on server (before uploading file)
-            # This saves bandwidth - only sends checksum (64 bytes) instead of entire CV (MB)
-            try:
-                check_response = self.session.post(
-                    f'{self.tanova_url}/api/sync/check-duplicate',
-                    json={'checksum': checksum},
-                    timeout=10
-                )
-
-                if check_response.status_code == 200:
-                    result = check_response.json()
-                    if result.get('exists'):
-                        # CV already exists on server - add to local cache and skip upload
-                        with self.history_lock:
-                            self.synced_files.add(checksum)
-                            self.unsaved_count += 1
-                        self._save_sync_history()
-                        candidate_name = result.get('candidateName', 'Unknown')
-                        logger.info(f'📋 Duplicate on server: {Path(file_path).name} -> {candidate_name}')
-                        return True
-                    # If not exists, continue with upload below
-            except Exception as check_error:
-                # If check fails, log warning but continue with upload (fallback behavior)
-                logger.warning(f'Could not check duplicate (continuing with upload): {check_error}')
+            # This saves bandwidth - only sends checksum (64 bytes) instead
+            # of entire CV (MB). Skipped when the initial scan's batch
+            # duplicate check already answered for this checksum.
+            if not server_checked:
+                try:
+                    check_response = self.session.post(
+                        f'{self.tanova_url}/api/sync/check-duplicate',
+                        json={'checksum': checksum},
+                        timeout=10
+                    )
+
+                    if check_response.status_code == 200:
+                        result = check_response.json()
+                        if result.get('exists'):
+                            # CV already exists on server - add to local cache and skip upload
+                            with self.history_lock:
+                                self.synced_files.add(checksum)
+                                self.pending_checksums.append(checksum)
+                            self._save_sync_history()
+                            candidate_name = result.get('candidateName', 'Unknown')
+                            logger.info(f'📋 Duplicate on server: {Path(file_path).name} -> {candidate_name}')
+                            return True
+                        # If not exists, continue with upload below
+                except Exception as check_error:
+                    # If check fails, log warning but continue with upload (fallback behavior)
+                    logger.warning(f'Could not check duplicate (continuing with upload): {check_error}')
 
             # Extract metadata
             metadata = self.extract_metadata_from_path(file_path)
 
-            # Read file content
-            with open(file_path, 'rb') as f:
-                file_content = f.read()
-
-            # Detect MIME type
-            mime_type = 'application/pdf'
-            if file_path.lower().endswith('.docx'):
-                mime_type = 'application/vnd.openxmlformats-officedocument.wordprocessingml.document'
-            elif file_path.lower().endswith('.doc'):
-                mime_type = 'application/msword'
-            elif file_path.lower().endswith('.txt'):
-                mime_type = 'text/plain'
-            elif file_path.lower().endswith('.md'):
-                mime_type = 'text/markdown'
-
-            files = {'file': (Path(file_path).name, file_content, mime_type)}
+            # Detect MIME type (single dict lookup instead of chained
+            # .lower().endswith() checks, and unknown suffixes no longer
+            # masquerade as PDFs)
+            mime_type = MIME_TYPES.get(Path(file_path).suffix.lower(), 'application/octet-stream')
 
             # Prepare form data
             data = {'checksum': checksum}
@@ -235,13 +520,29 @@ class TanovaCVHandler(FileSystemEventHandler):
                 data['email'] = metadata['email']
 
             # Upload using persistent session
+            # NEW: Hand the open file object to requests instead of reading
+            # the CV into our own bytes first - requests builds the body
+            # straight from the file, halving peak memory per worker
             logger.info(f'📤 Uploading to {self.tanova_url}/api/sync/upload: {Path(file_path).name} (AI processing typically takes 5-10 seconds...)')
-            response = self.session.post(
-                f'{self.tanova_url}/api/sync/upload',
-                files=files,
-                data=data,
-                timeout=60  # 60 seconds - CV processing typically takes 5-10 seconds
-            )
+            with open(file_path, 'rb') as fh:
+                if mime_type in ('text/plain', 'text/markdown'):
+                    # NEW: gzip text CVs before upload - plain text
+                    # compresses 3-10x, and level 1 costs ~1 ms/MB. PDFs
+                    # and DOCX are already compressed, so they ship as-is.
+                    file_part = (
+                        Path(file_path).name,
+                        gzip.compress(fh.read(), compresslevel=1),
+                        mime_type,
+                        {'Content-Encoding': 'gzip'},
+                    )
+                else:
+                    file_part = (Path(file_path).name, fh, mime_type)
+                response = self.session.post(
+                    f'{self.tanova_url}/api/sync/upload',
+                    files={'file': file_part},
+                    data=data,
+                    timeout=60  # 60 seconds - CV processing typically takes 5-10 seconds
+                )
             logger.info(f'📥 Received response {response.status_code} for: {Path(file_path).name}')
 
             if response.status_code == 200:
@@ -251,7 +552,7 @@ class TanovaCVHandler(FileSystemEventHandler):
                 # Thread-safe history update
                 with self.history_lock:
                     self.synced_files.add(checksum)
-                    self.unsaved_count += 1
+                    self.pending_checksums.append(checksum)
 
                 # Save history in batches
                 self._save_sync_history()
@@ -259,29 +560,87 @@ class TanovaCVHandler(FileSystemEventHandler):
                 logger.info(f'✓ Synced: {Path(file_path).name} -> Candidate ID: {candidate_id}')
                 return True
             else:
-                error_msg = response.json().get('message', 'Unknown error') if response.text else f'HTTP {response.status_code}'
+                # NEW: Decode the error body once, tolerating non-JSON
+                # responses (proxies and error pages often return HTML)
+                try:
+                    error_msg = response.json().get('message', f'HTTP {response.status_code}')
+                except ValueError:
+                    error_msg = (response.text or f'HTTP {response.status_code}')[:200]
                 logger.error(f'✗ Failed ({response.status_code}): {Path(file_path).name} - {error_msg}')
-
-                # Retry on server errors
-                if response.status_code >= 500 and retry_attempt < self.retry_count:
-                    logger.info(f'🔄 Retrying in {self.retry_delay}s... (attempt {retry_attempt + 1}/{self.retry_count})')
-                    time.sleep(self.retry_delay)
-                    return self.sync_file(file_path, retry_attempt + 1)
-
                 return False
 
         except Exception as e:
+            # Adapter-level retries are exhausted by the time we get here
             import traceback
             logger.error(f'✗ Failed: {Path(file_path).name} - {str(e)}')
             logger.debug(f'Traceback: {traceback.format_exc()}')
+            return False
 
-            # Retry on network errors
-            if retry_attempt < self.retry_count:
-                logger.info(f'🔄 Retrying in {self.retry_delay}s... (attempt {retry_attempt + 1}/{self.retry_count})')
-                time.sleep(self.retry_delay)
-                return self.sync_file(file_path, retry_attempt + 1)
+    def _iter_cv_files(self, root):
+        """
+        Recursively yield (path, stat) for supported CV files under root.
 
-            return False
+        NEW: os.scandir reuses the file type and stat info the kernel
+        returns with the directory read, so non-CV files are skipped
+        without the extra stat syscall per entry that os.walk pays.
+        """
+        try:
+            it = os.scandir(root)
+        except OSError as e:
+            logger.warning(f'Could not scan {root}: {e}')
+            return
+        with it:
+            for entry in it:
+                # One bad entry (broken symlink, file deleted between
+                # readdir and stat - routine in a live drop folder) must
+                # only lose that entry, not the rest of the directory
+                try:
+                    if entry.is_dir(follow_symlinks=False):
+                        is_dir = True
+                        st = None
+                    elif self._is_cv_file(entry.name):
+                        is_dir = False
+                        st = entry.stat()
+                    else:
+                        continue
+                except OSError as e:
+                    logger.warning(f'Could not stat {entry.path}: {e}')
+                    continue
+                if is_dir:
+                    yield from self._iter_cv_files(entry.path)
+                else:
+                    yield entry.path, st
+
+    def _check_duplicates_batch(self, checksums):
+        """
+        Ask the server which of the given checksums it already has.
+
+        NEW: One POST per 500 checksums replaces the per-file duplicate
+        check round-trip during the initial scan. Returns two sets: the
+        checksums that exist server-side, and every checksum whose chunk
+        got a definitive answer. Checksums outside the second set (their
+        chunk errored) fall back to sync_file's per-file check.
+        """
+        existing = set()
+        checked = set()
+        for start in range(0, len(checksums), self.DUPLICATE_BATCH_SIZE):
+            chunk = checksums[start:start + self.DUPLICATE_BATCH_SIZE]
+            try:
+                response = self.session.post(
+                    f'{self.tanova_url}/api/sync/check-duplicate-batch',
+                    json={'checksums': chunk},
+                    timeout=30
+                )
+                if response.status_code == 200:
+                    # Only trust checksums we actually sent - a stray
+                    # value from the server would otherwise be counted as
+                    # skipped and written into the packed history log,
+                    # where a malformed entry corrupts record alignment
+                    existing.update(set(response.json().get('existing', [])) & set(chunk))
+                    checked.update(chunk)
+            except Exception as e:
+                logger.warning(f'Batch duplicate check failed (falling back to per-file checks): {e}')
+        return existing, checked
 
     def sync_existing_files(self):
         """
@@ -290,14 +649,9 @@ class TanovaCVHandler(FileSystemEventHandler):
         NEW: Uses ThreadPoolExecutor to process multiple files in parallel.
         """
         logger.info(f'📂 Scanning for existing CV files in: {self.folder_path}')
-        files_found = []
 
-        # Recursively find all CV files
-        for root, dirs, files in os.walk(self.folder_path):
-            for filename in files:
-                file_path = os.path.join(root, filename)
-                if self._is_cv_file(file_path):
-                    files_found.append(file_path)
+        # Recursively find all CV files (scandir keeps their stat results)
+        files_found = list(self._iter_cv_files(self.folder_path))
 
         logger.info(f'📄 Found {len(files_found)} CV files')
 
@@ -310,12 +664,49 @@ class TanovaCVHandler(FileSystemEventHandler):
         skip_count = 0
 
         logger.info(f'🔍 Checking for already-synced files...')
-        for file_path in files_found:
-            checksum = self.calculate_checksum(file_path)
+        checksums = {}
+
+        # NEW: Hash the pre-filter pass on all workers. SHA-256 releases the
+        # GIL (and file_digest/mmap keep it released), so this scales with
+        # max_workers instead of serializing the scan on one thread.
+        # Threads, not a ProcessPoolExecutor: with the GIL released during
+        # hashing, processes would add fork and result-pickling overhead
+        # and lose the shared checksum/xattr caches for no extra
+        # parallelism.
+        # Hashing is CPU/disk-bound, so its pool is capped at the core
+        # count; upload workers only wait on the network, so max_workers
+        # itself can be raised well past it (50+ is fine - each in-flight
+        # upload costs one idle thread, and the server's AI processing
+        # concurrency becomes the real bound).
+        hash_workers = min(self.max_workers, os.cpu_count() or 1)
+        with ThreadPoolExecutor(max_workers=hash_workers) as hasher:
+            all_checksums = list(hasher.map(
+                self.calculate_checksum,
+                (path for path, _ in files_found),
+                (st for _, st in files_found),
+            ))
+
+        for (file_path, _), checksum in zip(files_found, all_checksums):
             if checksum and checksum in self.synced_files:
                 skip_count += 1
             elif checksum:
                 files_to_process.append(file_path)
+                checksums[file_path] = checksum
+
+        # NEW: One batched duplicate-check per 500 checksums instead of one
+        # round-trip per file (sync_file keeps the per-file check as fallback
+        # for watchdog events and batch-endpoint failures)
+        server_hits, server_checked = self._check_duplicates_batch(
+            [checksums[p] for p in files_to_process]
+        )
+        if server_hits:
+            with self.history_lock:
+                self.synced_files.update(server_hits)
+                self.pending_checksums.extend(server_hits)
+            self._save_sync_history(force=True)
+            files_to_process = [p for p in files_to_process if checksums[p] not in server_hits]
+            skip_count += len(server_hits)
+            logger.info(f'📋 Server already has {len(server_hits)} of the remaining CVs')
 
         logger.info(f'⏭️  Skipping {skip_count} already-synced files')
         logger.info(f'🚀 Processing {len(files_to_process)} new files with {self.max_workers} workers\n')
@@ -325,34 +716,44 @@ class TanovaCVHandler(FileSystemEventHandler):
         fail_count = 0
         total = len(files_to_process)
 
-        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
-            # Submit all tasks
+        # NEW: Submit in chunks of 50 to the shared worker pool (kept alive
+        # for watchdog events afterwards) and collect each chunk with one
+        # wait() call under a single deadline, instead of paying a blocking
+        # result(timeout) per future in an as_completed loop
+        processed = 0
+        for start in range(0, total, self.UPLOAD_CHUNK_SIZE):
+            chunk = files_to_process[start:start + self.UPLOAD_CHUNK_SIZE]
             future_to_file = {
-                executor.submit(self.sync_file, file_path): file_path
-                for file_path in files_to_process
+                self.executor.submit(
+                    self.sync_file,
+                    file_path,
+                    checksums[file_path],
+                    checksums[file_path] in server_checked,
+                ): file_path
+                for file_path in chunk
             }
 
-            logger.info(f'✓ Submitted {len(future_to_file)} tasks to executor')
+            # Deadline covers the whole chunk (uploads run max_workers-wide)
+            done, not_done = wait(future_to_file, timeout=70 * len(chunk))
 
-            # Process results as they complete
-            for i, future in enumerate(as_completed(future_to_file), 1):
+            for future in not_done:
+                future.cancel()
+                logger.error(f'✗ Timeout processing {Path(future_to_file[future]).name}')
+                fail_count += 1
+            for future in done:
                 file_path = future_to_file[future]
                 try:
-                    result = future.result(timeout=70)  # Slightly longer than request timeout
-                    if result:
+                    if future.result():
                         success_count += 1
                     else:
                         fail_count += 1
-                except TimeoutError:
-                    logger.error(f'✗ Timeout processing {Path(file_path).name} (exceeded 60 seconds)')
-                    fail_count += 1
                 except Exception as e:
                     logger.error(f'✗ Unexpected error processing {Path(file_path).name}: {e}')
                     fail_count += 1
 
-                # NEW: Progress reporting every 10 files
-                if i % 10 == 0 or i == total:
-                    logger.info(f'📊 Progress: {i}/{total} processed ({success_count} synced, {fail_count} failed)')
+            # NEW: Progress reporting once per chunk
+            processed += len(chunk)
+            logger.info(f'📊 Progress: {processed}/{total} processed ({success_count} synced, {fail_count} failed)')
 
         # Force save history at end
         self._save_sync_history(force=True)
@@ -429,8 +830,8 @@ def main():
         logger.info('\n⏹️  Stopping sync service...')
         observer.stop()
 
-        # Save any unsaved history
-        event_handler._save_sync_history(force=True)
+        # Drain workers and save any unsaved history
+        event_handler.stop()
 
     observer.join()
     logger.info('👋 Sync service stopped')